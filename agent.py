@@ -6,14 +6,27 @@ Core agent interaction functions for running autonomous coding sessions.
 """
 
 import asyncio
+import functools
+import itertools
+import os
 import re
-import subprocess
+import reprlib
+import sys
+import threading
 from pathlib import Path
-from typing import Optional
+from typing import Iterable, Optional
 
-from claude_code_sdk import ClaudeSDKClient
+from claude_code_sdk import (
+    AssistantMessage,
+    ClaudeSDKClient,
+    TextBlock,
+    ToolResultBlock,
+    ToolUseBlock,
+    UserMessage,
+)
 
 from client import create_client
+from linear_config import LINEAR_PROJECT_MARKER
 from progress import print_session_header, print_progress_summary, is_linear_initialized
 from prompts import get_initializer_prompt, get_coding_prompt, copy_spec_to_project
 
@@ -25,7 +38,89 @@ AUTO_CONTINUE_DELAY_SECONDS = 3
 SCAFFOLD_SCRIPT = Path.home() / ".claude" / "skills" / "build-anything" / "scripts" / "init_project.py"
 
 # Valid app types for scaffolding
-VALID_APP_TYPES = {"landing", "crud", "dashboard", "ai", "game", "saas", "social", "collaboration", "ecommerce", "directory"}
+VALID_APP_TYPES = frozenset({"landing", "crud", "dashboard", "ai", "game", "saas", "social", "collaboration", "ecommerce", "directory"})
+
+
+class _PreviewRepr(reprlib.Repr):
+    """reprlib.Repr that keeps dict keys in insertion order (the base class sorts them)."""
+
+    def repr_dict(self, x, level):
+        if not x:
+            return "{}"
+        if level <= 0:
+            return "{...}"
+        pieces = [
+            f"{self.repr1(key, level - 1)}: {self.repr1(value, level - 1)}"
+            for key, value in itertools.islice(x.items(), self.maxdict)
+        ]
+        if len(x) > self.maxdict:
+            pieces.append("...")
+        return "{" + ", ".join(pieces) + "}"
+
+
+# Truncating repr for tool inputs/results, so large payloads (e.g. an Edit of a
+# big file) are never fully stringified just to print a preview
+_PREVIEW_REPR = _PreviewRepr()
+_PREVIEW_REPR.maxstring = 200
+_PREVIEW_REPR.maxother = 200
+_PREVIEW_REPR.maxdict = 6
+_PREVIEW_REPR.maxlist = 6
+
+
+def _preview(value, limit: int) -> str:
+    """Bounded repr of a tool payload, cut to limit characters (plus "...")."""
+    text = _PREVIEW_REPR.repr(value)
+    if len(text) > limit:
+        return text[:limit] + "..."
+    return text
+
+
+def _result_texts(content) -> list[str]:
+    """Text of a tool result: the string itself, or the "text" items of list content."""
+    if isinstance(content, str):
+        return [content]
+    if isinstance(content, list):
+        return [
+            item["text"] for item in content
+            if isinstance(item, dict) and isinstance(item.get("text"), str)
+        ]
+    return []
+
+
+def _head(texts: list[str], limit: int) -> str:
+    """First limit characters of the texts joined by newlines, without joining them all."""
+    parts = []
+    remaining = limit
+    for text in texts:
+        if remaining <= 0:
+            break
+        parts.append(text[:remaining])
+        remaining -= len(parts[-1]) + 1  # +1 for the joining newline
+    return "\n".join(parts)[:limit]
+
+
+# Marker the security hook puts in the result of a blocked command
+_BLOCKED_RE = re.compile("blocked", re.IGNORECASE)
+
+# Common Convex indicators in a spec, matched in a single case-insensitive scan
+_CONVEX_RE = re.compile(r"convex|real-?time database|serverless backend", re.IGNORECASE)
+
+# Spec contents keyed by path: ((mtime_ns, size), text)
+_SPEC_CACHE: dict[Path, tuple[tuple[int, int], str]] = {}
+
+
+def _load_spec(spec_path: Path) -> str:
+    """Read the spec file, reusing the cached contents while it is unchanged."""
+    st = spec_path.stat()
+    fingerprint = (st.st_mtime_ns, st.st_size)
+
+    cached = _SPEC_CACHE.get(spec_path)
+    if cached and cached[0] == fingerprint:
+        return cached[1]
+
+    content = spec_path.read_text()
+    _SPEC_CACHE[spec_path] = (fingerprint, content)
+    return content
 
 
 def spec_uses_convex(spec_path: Path) -> bool:
@@ -37,14 +132,7 @@ def spec_uses_convex(spec_path: Path) -> bool:
     if not spec_path or not spec_path.exists():
         return False
 
-    content = spec_path.read_text().lower()
-    # Check for common Convex indicators
-    return any(indicator in content for indicator in [
-        "convex",
-        "real-time database",
-        "realtime database",
-        "serverless backend",
-    ])
+    return bool(_CONVEX_RE.search(_load_spec(spec_path)))
 
 
 def is_convex_configured(project_dir: Path) -> bool:
@@ -63,28 +151,70 @@ def is_convex_configured(project_dir: Path) -> bool:
         return True
 
     # Check for .env.local with Convex URL
-    if env_local.exists():
-        content = env_local.read_text()
-        if "CONVEX_URL" in content or "NEXT_PUBLIC_CONVEX_URL" in content:
-            return True
+    # (NEXT_PUBLIC_CONVEX_URL contains CONVEX_URL, so one check covers both)
+    if env_local.exists() and b"CONVEX_URL" in env_local.read_bytes():
+        return True
 
     return False
 
 
-def ensure_convex_configured(project_dir: Path, spec_path: Optional[Path] = None) -> bool:
+async def _ainput(prompt: str) -> str:
+    """
+    Awaitable input() that leaves the event loop free while waiting.
+
+    The read runs in a daemon thread that resolves a Future, rather than in
+    the default executor: if the wait is cancelled (e.g. Ctrl-C), the thread
+    may stay blocked in input(), and a daemon thread doesn't hold up loop
+    shutdown or interpreter exit the way an executor thread would.
+    """
+    loop = asyncio.get_running_loop()
+    future = loop.create_future()
+
+    def resolve(result=None, error=None):
+        if future.done():  # Cancelled while waiting
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    def read():
+        try:
+            line = input(prompt)
+        except Exception as e:  # e.g. EOFError
+            outcome = {"error": e}
+        else:
+            outcome = {"result": line}
+        try:
+            loop.call_soon_threadsafe(functools.partial(resolve, **outcome))
+        except RuntimeError:  # Loop already closed
+            pass
+
+    threading.Thread(target=read, name="convex-setup-input", daemon=True).start()
+    return await future
+
+
+async def ensure_convex_configured(
+    project_dir: Path,
+    spec_path: Optional[Path] = None,
+    spec_needs_convex: Optional[bool] = None,
+) -> bool:
     """
     Ensure Convex is configured before continuing. Prompts user if not.
 
     Args:
         project_dir: The project directory
         spec_path: Optional path to spec file (to check if Convex is used)
+        spec_needs_convex: Precomputed spec_uses_convex(spec_path) result, if known
 
     Returns:
         True if Convex is configured (or not needed), False if user skipped setup
     """
     # Check if this project even uses Convex
+    if spec_needs_convex is None:
+        spec_needs_convex = bool(spec_path) and spec_uses_convex(spec_path)
     convex_folder = project_dir / "convex"
-    uses_convex = convex_folder.exists() or (spec_path and spec_uses_convex(spec_path))
+    uses_convex = convex_folder.exists() or spec_needs_convex
 
     if not uses_convex:
         # Project doesn't use Convex, no setup needed
@@ -101,7 +231,7 @@ def ensure_convex_configured(project_dir: Path, spec_path: Optional[Path] = None
     print("=" * 70)
     print("\nConvex requires interactive setup. Please run in another terminal:")
     print()
-    print(f"  cd {project_dir.resolve()}")
+    print(f"  cd {project_dir}")
     print("  npx convex dev")
     print()
     print("Follow the prompts to:")
@@ -116,8 +246,15 @@ def ensure_convex_configured(project_dir: Path, spec_path: Optional[Path] = None
     print("=" * 70)
 
     try:
-        response = input("\nPress Enter when ready (or 'skip'): ").strip().lower()
-    except (EOFError, KeyboardInterrupt):
+        response = (await _ainput("\nPress Enter when ready (or 'skip'): ")).strip().lower()
+    except (EOFError, KeyboardInterrupt, asyncio.CancelledError) as e:
+        # Under asyncio.run, Ctrl-C cancels the main task (CancelledError here)
+        # rather than raising KeyboardInterrupt. Swallow that one cancellation
+        # so the run carries on without Convex.
+        if isinstance(e, asyncio.CancelledError):
+            task = asyncio.current_task()
+            if task is not None and hasattr(task, "uncancel"):
+                task.uncancel()
         print("\nInterrupted - continuing without Convex")
         return False
 
@@ -131,9 +268,9 @@ def ensure_convex_configured(project_dir: Path, spec_path: Optional[Path] = None
 
         # Also prompt to seed the database if seed function exists
         prospects_file = project_dir / "convex" / "prospects.ts"
-        if prospects_file.exists() and "seed" in prospects_file.read_text():
+        if prospects_file.exists() and b"seed" in prospects_file.read_bytes():
             print("\nTip: Seed the database with mock data:")
-            print(f"  cd {project_dir.resolve()}")
+            print(f"  cd {project_dir}")
             print("  npx convex run prospects:seed")
 
         return True
@@ -143,20 +280,63 @@ def ensure_convex_configured(project_dir: Path, spec_path: Optional[Path] = None
         return False
 
 
+@functools.lru_cache(maxsize=None)
+def _fields_re(fields: tuple[str, ...]) -> re.Pattern:
+    """Compile (once per field set) a regex matching any of the spec XML fields."""
+    names = "|".join(re.escape(field) for field in fields)
+    return re.compile(rf"<({names})>\s*([^<]+?)\s*</\1>", re.IGNORECASE)
+
+
+def parse_spec_fields(spec_content: str, fields: Iterable[str]) -> dict[str, str]:
+    """
+    Parse several field values from the spec XML content in a single pass.
+
+    Specs are only loosely XML (free text, comments, stray '&'), so this
+    scans with one regex rather than an XML parser. As with a single-field
+    lookup, only the first occurrence of each field counts.
+
+    Returns:
+        Dict of field -> value for fields that are present and not placeholders
+    """
+    wanted = {field.lower(): field for field in fields}
+    if not wanted:
+        return {}
+
+    seen: set[str] = set()
+    result: dict[str, str] = {}
+
+    for match in _fields_re(tuple(wanted)).finditer(spec_content):
+        tag = match.group(1).lower()
+        if tag in seen:
+            continue
+        seen.add(tag)
+
+        value = match.group(2).strip()
+        # Skip placeholder values
+        if not (value.startswith("{{") and value.endswith("}}")):
+            result[wanted[tag]] = value
+
+        if len(seen) == len(wanted):
+            break
+
+    return result
+
+
 def parse_spec_field(spec_content: str, field: str) -> Optional[str]:
     """Parse a field value from the spec XML content."""
-    pattern = rf"<{field}>\s*([^<]+?)\s*</{field}>"
-    match = re.search(pattern, spec_content, re.IGNORECASE)
-    if match:
-        value = match.group(1).strip()
-        # Skip placeholder values
-        if value.startswith("{{") and value.endswith("}}"):
-            return None
-        return value
-    return None
+    return parse_spec_fields(spec_content, [field]).get(field)
 
 
-def scaffold_project(project_dir: Path, spec_path: Path) -> bool:
+def _dir_non_empty(path: Path) -> bool:
+    """Check whether a directory has any entries, stopping at the first one."""
+    try:
+        with os.scandir(path) as entries:
+            return next(entries, None) is not None
+    except FileNotFoundError:
+        return False
+
+
+async def scaffold_project(project_dir: Path, spec_path: Path) -> bool:
     """
     Scaffold a new Next.js + Convex + Clerk project using build-anything script.
 
@@ -178,20 +358,19 @@ def scaffold_project(project_dir: Path, spec_path: Path) -> bool:
         return False
 
     # Check if directory already exists (shouldn't scaffold over existing project)
-    if project_dir.exists() and any(project_dir.iterdir()):
+    if _dir_non_empty(project_dir):
         print(f"\nWarning: Directory {project_dir} already exists and is not empty.")
         print("Skipping scaffolding to avoid overwriting.")
         return False
 
     # Parse spec for app type
-    spec_content = spec_path.read_text()
+    spec_content = _load_spec(spec_path)
 
-    app_type = parse_spec_field(spec_content, "app_type")
-    if not app_type or app_type.lower() not in VALID_APP_TYPES:
+    spec_fields = parse_spec_fields(spec_content, ["app_type"])
+    app_type = spec_fields.get("app_type", "").strip().lower()
+    if app_type not in VALID_APP_TYPES:
         app_type = "crud"  # Default
         print(f"\nNo valid app_type in spec, defaulting to: {app_type}")
-    else:
-        app_type = app_type.lower()
 
     # Use the directory name as project name (keep it simple)
     project_name = project_dir.name
@@ -217,14 +396,12 @@ def scaffold_project(project_dir: Path, spec_path: Path) -> bool:
     print(f"Running: {' '.join(cmd)}\n")
 
     try:
-        result = subprocess.run(
-            cmd,
-            capture_output=False,  # Let output stream to terminal
-            text=True,
-        )
+        # Run without blocking the event loop; output streams to terminal
+        proc = await asyncio.create_subprocess_exec(*cmd, stdout=None, stderr=None)
+        returncode = await proc.wait()
 
-        if result.returncode != 0:
-            print(f"\nWarning: Scaffold script exited with code {result.returncode}")
+        if returncode != 0:
+            print(f"\nWarning: Scaffold script exited with code {returncode}")
             print("Agent will continue and may need to fix setup issues.")
             return False
 
@@ -239,6 +416,42 @@ def scaffold_project(project_dir: Path, spec_path: Path) -> bool:
         return False
 
 
+class _OutputCoalescer:
+    """
+    Buffer streamed console output and write it in batches.
+
+    Output is flushed once the buffer reaches max_chars, or at most
+    max_delay seconds after the first buffered write (via a loop timer,
+    so text never sits unflushed while the agent runs a long tool call).
+    """
+
+    def __init__(self, max_chars: int = 4096, max_delay: float = 0.05):
+        self._stream = sys.stdout
+        self._max_chars = max_chars
+        self._max_delay = max_delay
+        self._buf: list[str] = []
+        self._size = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def write(self, text: str) -> None:
+        self._buf.append(text)
+        self._size += len(text)
+        if self._size >= self._max_chars:
+            self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self._max_delay, self.flush)
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._buf:
+            self._stream.write("".join(self._buf))
+            self._buf.clear()
+            self._size = 0
+        self._stream.flush()
+
+
 async def run_agent_session(
     client: ClaudeSDKClient,
     message: str,
@@ -259,60 +472,82 @@ async def run_agent_session(
     """
     print("Sending prompt to Claude Agent SDK...\n")
 
+    out = _OutputCoalescer()
     try:
         # Send the query
         await client.query(message)
 
-        # Collect response text and show tool use
-        response_text = ""
+        # Collect response text chunks (joined once at the end) and show tool use
+        text_chunks: list[str] = []
         async for msg in client.receive_response():
-            msg_type = type(msg).__name__
+            # Identity checks on the SDK types - this loop runs per streamed chunk
+            msg_type = type(msg)
 
             # Handle AssistantMessage (text and tool use)
-            if msg_type == "AssistantMessage" and hasattr(msg, "content"):
+            if msg_type is AssistantMessage:
                 for block in msg.content:
-                    block_type = type(block).__name__
-
-                    if block_type == "TextBlock" and hasattr(block, "text"):
-                        response_text += block.text
-                        print(block.text, end="", flush=True)
-                    elif block_type == "ToolUseBlock" and hasattr(block, "name"):
-                        print(f"\n[Tool: {block.name}]", flush=True)
-                        if hasattr(block, "input"):
-                            input_str = str(block.input)
-                            if len(input_str) > 200:
-                                print(f"   Input: {input_str[:200]}...", flush=True)
-                            else:
-                                print(f"   Input: {input_str}", flush=True)
+                    block_type = type(block)
+
+                    if block_type is TextBlock:
+                        text_chunks.append(block.text)
+                        out.write(block.text)
+                    elif block_type is ToolUseBlock:
+                        out.write(f"\n[Tool: {block.name}]\n")
+                        out.write(f"   Input: {_preview(block.input, 200)}\n")
 
             # Handle UserMessage (tool results)
-            elif msg_type == "UserMessage" and hasattr(msg, "content"):
+            elif msg_type is UserMessage and isinstance(msg.content, list):
                 for block in msg.content:
-                    block_type = type(block).__name__
-
-                    if block_type == "ToolResultBlock":
+                    if type(block) is ToolResultBlock:
                         result_content = getattr(block, "content", "")
                         is_error = getattr(block, "is_error", False)
 
                         # Check if command was blocked by security hook
-                        if "blocked" in str(result_content).lower():
-                            print(f"   [BLOCKED] {result_content}", flush=True)
+                        # (searched in place - results can be multi-MB file reads)
+                        result_texts = _result_texts(result_content)
+                        if any(_BLOCKED_RE.search(text) for text in result_texts):
+                            out.write(f"   [BLOCKED] {result_content}\n")
                         elif is_error:
-                            # Show errors (truncated)
-                            error_str = str(result_content)[:500]
-                            print(f"   [Error] {error_str}", flush=True)
+                            # Show errors (first 500 characters of their text)
+                            if result_texts:
+                                error_str = _head(result_texts, 500)
+                            else:
+                                error_str = _preview(result_content, 500)
+                            out.write(f"   [Error] {error_str}\n")
                         else:
                             # Tool succeeded - just show brief confirmation
-                            print("   [Done]", flush=True)
+                            out.write("   [Done]\n")
 
+        out.flush()
         print("\n" + "-" * 70 + "\n")
-        return "continue", response_text
+        return "continue", "".join(text_chunks)
 
     except Exception as e:
+        out.flush()
         print(f"Error during agent session: {e}")
         return "error", str(e)
 
 
+# Last seen (mtime_ns, size) of each project's state file, or None if missing
+_last_progress_fp: dict[Path, Optional[tuple[int, int]]] = {}
+
+
+def _print_progress_if_changed(project_dir: Path) -> None:
+    """Print the progress summary, skipping it if the state file hasn't changed."""
+    state_file = project_dir / LINEAR_PROJECT_MARKER
+    try:
+        st = state_file.stat()
+        fingerprint = (st.st_mtime_ns, st.st_size)
+    except FileNotFoundError:
+        fingerprint = None
+
+    if project_dir in _last_progress_fp and _last_progress_fp[project_dir] == fingerprint:
+        return
+
+    _last_progress_fp[project_dir] = fingerprint
+    print_progress_summary(project_dir)
+
+
 async def run_autonomous_agent(
     project_dir: Path,
     model: str,
@@ -328,6 +563,9 @@ async def run_autonomous_agent(
         max_iterations: Maximum number of iterations (None for unlimited)
         spec_path: Optional path to a custom app spec file
     """
+    # Resolve once; everything below (including create_client) uses the absolute path
+    project_dir = project_dir.resolve()
+
     print("\n" + "=" * 70)
     print("  AUTONOMOUS CODING AGENT DEMO")
     print("=" * 70)
@@ -350,8 +588,12 @@ async def run_autonomous_agent(
         print()
 
         # Scaffold the project first (Next.js + Convex + Clerk)
-        # This creates the project directory
-        scaffold_project(project_dir, spec_path)
+        # This creates the project directory. The spec's Convex check runs
+        # alongside it; the spec copy waits, as the scaffold owns the directory.
+        _, spec_needs_convex = await asyncio.gather(
+            scaffold_project(project_dir, spec_path),
+            asyncio.to_thread(spec_uses_convex, spec_path),
+        )
 
         # Ensure directory exists (in case scaffold failed or was skipped)
         project_dir.mkdir(parents=True, exist_ok=True)
@@ -361,7 +603,7 @@ async def run_autonomous_agent(
 
         # Check if Convex needs to be configured (pauses for user input if needed)
         # This prevents the agent from getting stuck on Convex setup later
-        ensure_convex_configured(project_dir, spec_path)
+        await ensure_convex_configured(project_dir, spec_path, spec_needs_convex)
 
         print()
         print("=" * 70)
@@ -372,13 +614,14 @@ async def run_autonomous_agent(
         print()
     else:
         print("Continuing existing project (Linear initialized)")
-        print_progress_summary(project_dir)
+        _print_progress_if_changed(project_dir)
 
         # Check Convex on continuation too (in case it was skipped earlier)
-        ensure_convex_configured(project_dir, spec_path)
+        await ensure_convex_configured(project_dir, spec_path)
 
     # Main loop
     iteration = 0
+    next_client = None
 
     while True:
         iteration += 1
@@ -392,8 +635,9 @@ async def run_autonomous_agent(
         # Print session header
         print_session_header(iteration, is_first_run)
 
-        # Create client (fresh context)
-        client = create_client(project_dir, model)
+        # Create client (fresh context), unless one was prepared during the last delay
+        client = next_client or create_client(project_dir, model)
+        next_client = None
 
         # Choose prompt based on session type
         if is_first_run:
@@ -409,18 +653,18 @@ async def run_autonomous_agent(
         # Handle status
         if status == "continue":
             print(f"\nAgent will auto-continue in {AUTO_CONTINUE_DELAY_SECONDS}s...")
-            print_progress_summary(project_dir)
-            await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
+            _print_progress_if_changed(project_dir)
 
         elif status == "error":
             print("\nSession encountered an error")
             print("Will retry with a fresh session...")
-            await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
 
-        # Small delay between sessions
+        # Delay between sessions, preparing the next client meanwhile
         if max_iterations is None or iteration < max_iterations:
             print("\nPreparing next session...\n")
-            await asyncio.sleep(1)
+            prep = asyncio.create_task(asyncio.to_thread(create_client, project_dir, model))
+            await asyncio.sleep(AUTO_CONTINUE_DELAY_SECONDS)
+            next_client = await prep
 
     # Final summary
     print("\n" + "=" * 70)
@@ -433,7 +677,7 @@ async def run_autonomous_agent(
     print("\n" + "-" * 70)
     print("  TO RUN THE GENERATED APPLICATION:")
     print("-" * 70)
-    print(f"\n  cd {project_dir.resolve()}")
+    print(f"\n  cd {project_dir}")
     print("  ./init.sh           # Run the setup script")
     print("  # Or manually:")
     print("  npm install && npm run dev")
@@ -25,6 +25,36 @@ from agent import run_autonomous_agent
 # See: https://www.anthropic.com/news/claude-opus-4-5
 DEFAULT_MODEL = "claude-opus-4-5-20251101"
 
+# README written into the generations/ directory on first run
+_GENERATIONS_README = """# Generated Projects
+
+This directory contains projects created by the Linear Coding Agent Harness.
+
+Each subdirectory is a complete, standalone project that can be:
+- Opened in its own IDE workspace
+- Committed to its own git repository
+- Deployed independently
+
+## Structure
+
+```
+generations/
+├── project-1/          # First generated project
+│   ├── src/
+│   ├── convex/
+│   ├── package.json
+│   └── ...
+├── project-2/          # Second generated project
+│   └── ...
+└── README.md           # This file
+```
+
+## Note
+
+This directory is excluded from the harness git repository (via .gitignore).
+Each generated project should be initialized as its own git repo if needed.
+"""
+
 
 def parse_args() -> argparse.Namespace:
     """Parse command line arguments."""
@@ -121,38 +151,13 @@ def main() -> None:
         print(f"Project will be created in: {project_dir}")
 
     # Ensure generations directory exists with a README
-    if not generations_dir.exists():
-        generations_dir.mkdir(parents=True, exist_ok=True)
-    readme_path = generations_dir / "README.md"
-    if not readme_path.exists():
-        readme_path.write_text("""# Generated Projects
-
-This directory contains projects created by the Linear Coding Agent Harness.
-
-Each subdirectory is a complete, standalone project that can be:
-- Opened in its own IDE workspace
-- Committed to its own git repository
-- Deployed independently
-
-## Structure
-
-```
-generations/
-├── project-1/          # First generated project
-│   ├── src/
-│   ├── convex/
-│   ├── package.json
-│   └── ...
-├── project-2/          # Second generated project
-│   └── ...
-└── README.md           # This file
-```
-
-## Note
-
-This directory is excluded from the harness git repository (via .gitignore).
-Each generated project should be initialized as its own git repo if needed.
-""")
+    # ("x" mode creates the README atomically, only if it doesn't exist yet)
+    generations_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        with open(generations_dir / "README.md", "x", encoding="utf-8") as f:
+            f.write(_GENERATIONS_README)
+    except FileExistsError:
+        pass
 
     # Run the agent
     try:
@@ -5,42 +5,124 @@ Claude SDK Client Configuration
 Functions for creating and configuring the Claude Agent SDK client.
 """
 
+import functools
+import hashlib
 import json
+import mmap
 import os
+import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Optional
 
-from claude_code_sdk import ClaudeCodeOptions, ClaudeSDKClient
-from claude_code_sdk.types import HookMatcher
+try:
+    import orjson
+except ImportError:  # Optional - falls back to the stdlib json parser
+    orjson = None
 
-from security import bash_security_hook
+# The SDK (and the security hook) are imported lazily in create_client, so
+# this module's constants and helpers can be imported without loading them
+if TYPE_CHECKING:
+    from claude_code_sdk import ClaudeSDKClient
 
 
-def get_linear_oauth_from_credentials() -> Optional[dict]:
+# Whether the security settings banner has been printed in this process
+_settings_banner_shown = False
+
+# Settings files as last written or verified: path -> (digest, (mtime_ns, size))
+_settings_written: dict[Path, tuple[bytes, tuple[int, int]]] = {}
+
+# Last credentials lookup: ((mtime_ns, size), result) - tokens rarely change
+# within a process, so the file is only re-read when it is modified
+_linear_oauth_cache: Optional[tuple[tuple[int, int], Optional[tuple[str, str]]]] = None
+
+
+# Files above this size are mapped rather than read (mmap setup isn't worth it for small files)
+_MMAP_MIN_SIZE = 64 * 1024
+
+# Prefault mapped pages up front where supported (Linux), rather than
+# stalling on page-ins while parsing a cold file
+if hasattr(mmap, "MAP_POPULATE"):
+    _MMAP_READ_ARGS = {"flags": mmap.MAP_SHARED | mmap.MAP_POPULATE, "prot": mmap.PROT_READ}
+else:
+    _MMAP_READ_ARGS = {"access": mmap.ACCESS_READ}
+
+
+def _load_json_file(path: Path, marker: Optional[bytes] = None) -> Any:
+    """
+    Parse a JSON file, using orjson (and mmap for large files) when available.
+
+    If marker is given and doesn't occur in the raw file bytes, returns None
+    without parsing - a cheap way to skip files that can't hold what we need.
+    """
+    with open(path, "rb") as f:
+        if orjson is None or os.fstat(f.fileno()).st_size <= _MMAP_MIN_SIZE:
+            data = f.read()
+            if marker is not None and marker not in data:
+                return None
+            return orjson.loads(data) if orjson is not None else json.loads(data)
+
+        # Hint the kernel to start reading the whole file now (small files
+        # are read in one call above, where this would be an extra syscall)
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_WILLNEED)
+
+        with mmap.mmap(f.fileno(), 0, **_MMAP_READ_ARGS) as mm:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mm.madvise(mmap.MADV_SEQUENTIAL)
+            if marker is not None and mm.find(marker) == -1:
+                return None
+            with memoryview(mm) as view:
+                return orjson.loads(view)
+
+
+@functools.cache
+def _credentials_path() -> Path:
+    """Path to Claude Code's credentials file (home directory looked up once)."""
+    return Path.home() / ".claude" / ".credentials.json"
+
+
+def get_linear_oauth_from_credentials() -> Optional[tuple[str, str]]:
     """
     Extract Linear OAuth credentials from Claude Code's global config.
 
-    Returns dict with 'accessToken' and 'serverUrl' if found, None otherwise.
+    Returns (access_token, server_url) if found, None otherwise.
     """
-    credentials_path = Path.home() / ".claude" / ".credentials.json"
-    if not credentials_path.exists():
-        return None
+    global _linear_oauth_cache
 
+    credentials_path = _credentials_path()
     try:
-        with open(credentials_path) as f:
-            creds = json.load(f)
+        st = credentials_path.stat()
+    except FileNotFoundError:
+        return None
+
+    fingerprint = (st.st_mtime_ns, st.st_size)
+    if _linear_oauth_cache and _linear_oauth_cache[0] == fingerprint:
+        return _linear_oauth_cache[1]
 
+    result = _read_linear_oauth(credentials_path)
+    _linear_oauth_cache = (fingerprint, result)
+    return result
+
+
+def _read_linear_oauth(credentials_path: Path) -> Optional[tuple[str, str]]:
+    """Read the Linear OAuth entry from the credentials file."""
+    try:
         # Find Linear MCP OAuth entry (key format: "linear-server|{hash}")
-        mcp_oauth = creds.get("mcpOAuth", {})
+        # Skip parsing entirely if no such key appears in the file
+        creds = _load_json_file(credentials_path, marker=b'"linear-server')
+        if creds is None:
+            return None
+
+        mcp_oauth = creds.get("mcpOAuth")
+        if not mcp_oauth:
+            return None
+
         for key, value in mcp_oauth.items():
             if key.startswith("linear-server"):
                 access_token = value.get("accessToken")
                 server_url = value.get("serverUrl")
                 if access_token and server_url:
-                    return {
-                        "accessToken": access_token,
-                        "serverUrl": server_url,
-                    }
+                    return access_token, server_url
     except (json.JSONDecodeError, KeyError, TypeError):
         pass
 
@@ -49,7 +131,8 @@ def get_linear_oauth_from_credentials() -> Optional[dict]:
 
 # Linear MCP tools for project management
 # Official Linear MCP server at mcp.linear.app (server name: linear-server)
-LINEAR_TOOLS = [
+# (interned, so each name is a single shared string object)
+LINEAR_TOOLS = tuple(sys.intern(tool) for tool in (
     # Team & Project discovery
     "mcp__linear-server__list_teams",
     "mcp__linear-server__get_team",
@@ -80,25 +163,158 @@ LINEAR_TOOLS = [
     "mcp__linear-server__get_document",
     "mcp__linear-server__create_document",
     "mcp__linear-server__update_document",
-]
+))
+
+# For O(1) membership checks
+LINEAR_TOOLS_SET = frozenset(LINEAR_TOOLS)
 
 # Built-in tools
-BUILTIN_TOOLS = [
+BUILTIN_TOOLS = tuple(sys.intern(tool) for tool in (
     "Read",
     "Write",
     "Edit",
     "Glob",
     "Grep",
     "Bash",
-]
+))
+
+# Tools the agent may use (static, so built once at import)
+ALLOWED_TOOLS = (*BUILTIN_TOOLS, *LINEAR_TOOLS)
+
+# Permission rules for the security settings file
+_PERMISSIONS_ALLOW = (
+    # Allow all file operations within the project directory
+    "Read(./**)",
+    "Write(./**)",
+    "Edit(./**)",
+    "Glob(./**)",
+    "Grep(./**)",
+    # Bash permission granted here, but actual commands are validated
+    # by the bash_security_hook (see security.py for allowed commands)
+    "Bash(*)",
+    # Allow Linear MCP tools for project management
+    *LINEAR_TOOLS,
+    # Note: Browser automation uses dev-browser skill via Bash scripts
+    # (no MCP tools needed - uses Playwright directly)
+)
+
+# Comprehensive security settings, identical for every session
+# Note: Using relative paths ("./**") restricts access to project directory
+# since cwd is set to project_dir
+_SECURITY_SETTINGS = {
+    "sandbox": {"enabled": True, "autoAllowBashIfSandboxed": True},
+    "permissions": {
+        "defaultMode": "acceptEdits",  # Auto-approve edits within allowed directories
+        "allow": list(_PERMISSIONS_ALLOW),
+    },
+}
+
+# Serialized once, as written to each project's .claude_settings.json
+_SECURITY_SETTINGS_JSON = json.dumps(_SECURITY_SETTINGS, indent=2).encode()
+
+SYSTEM_PROMPT = (
+    "You are an expert full-stack developer building a production-quality web application. "
+    "You use Linear for project management and tracking all your work. "
+    "For browser automation, you use the dev-browser skill via Bash scripts with Playwright."
+)
+
+LINEAR_MCP_URL = "https://mcp.linear.app/mcp"
+
+
+def _write_settings_if_changed(settings_file: Path, payload: bytes) -> bool:
+    """
+    Write the settings file atomically, unless it already holds payload.
+
+    A file this process has already written (or verified) is recognised by
+    its digest and stat alone, without re-reading it.
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    digest = hashlib.blake2b(payload, digest_size=16).digest()
+
+    try:
+        st = settings_file.stat()
+    except FileNotFoundError:
+        st = None
+        # Ensure project directory exists before creating settings file
+        # (only needed when the file is missing, i.e. on first use)
+        settings_file.parent.mkdir(parents=True, exist_ok=True)
+
+    if st is not None:
+        fingerprint = (st.st_mtime_ns, st.st_size)
+        if _settings_written.get(settings_file) == (digest, fingerprint):
+            return False
+        if st.st_size == len(payload) and settings_file.read_bytes() == payload:
+            # Written by an earlier run
+            _settings_written[settings_file] = (digest, fingerprint)
+            return False
+
+    # Write to a temp file (normally in a single write() call) and rename,
+    # so the file is never seen half-written
+    tmp_file = settings_file.with_name(settings_file.name + ".tmp")
+    fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        try:
+            view = memoryview(payload)
+            while view:
+                view = view[os.write(fd, view):]
+        finally:
+            os.close(fd)
+        os.replace(tmp_file, settings_file)
+    except BaseException:
+        tmp_file.unlink(missing_ok=True)
+        raise
+
+    st = settings_file.stat()
+    _settings_written[settings_file] = (digest, (st.st_mtime_ns, st.st_size))
+    return True
 
 
-def create_client(project_dir: Path, model: str) -> ClaudeSDKClient:
+@functools.cache
+def get_env_credentials() -> tuple[str, Optional[str]]:
+    """
+    Read credentials from the environment (once per process).
+
+    Returns:
+        (oauth_token, linear_api_key) - linear_api_key is None if not set
+
+    Raises:
+        ValueError: If CLAUDE_CODE_OAUTH_TOKEN is not set
+    """
+    oauth_token = os.environ.get("CLAUDE_CODE_OAUTH_TOKEN")
+    if not oauth_token:
+        raise ValueError(
+            "CLAUDE_CODE_OAUTH_TOKEN environment variable not set.\n"
+            "Run 'claude setup-token after installing the Claude Code CLI."
+        )
+
+    # Linear API key is optional - if not set, assumes user has Linear MCP configured globally
+    linear_api_key = os.environ.get("LINEAR_API_KEY")
+
+    return oauth_token, linear_api_key
+
+
+@functools.cache
+def _security_hooks() -> dict:
+    """Security hooks shared by every session (built on first use)."""
+    from claude_code_sdk.types import HookMatcher
+
+    from security import bash_security_hook
+
+    return {
+        "PreToolUse": [
+            HookMatcher(matcher="Bash", hooks=[bash_security_hook]),
+        ],
+    }
+
+
+def create_client(project_dir: Path, model: str) -> "ClaudeSDKClient":
     """
     Create a Claude Agent SDK client with multi-layered security.
 
     Args:
-        project_dir: Directory for the project
+        project_dir: Directory for the project (resolved here if not already absolute)
         model: Claude model to use
 
     Returns:
@@ -110,56 +326,25 @@ def create_client(project_dir: Path, model: str) -> ClaudeSDKClient:
     3. Security hooks - Bash commands validated against an allowlist
        (see security.py for ALLOWED_COMMANDS)
     """
-    api_key = os.environ.get("CLAUDE_CODE_OAUTH_TOKEN")
-    if not api_key:
-        raise ValueError(
-            "CLAUDE_CODE_OAUTH_TOKEN environment variable not set.\n"
-            "Run 'claude setup-token after installing the Claude Code CLI."
-        )
+    from claude_code_sdk import ClaudeCodeOptions, ClaudeSDKClient
 
-    # Linear API key is optional - if not set, assumes user has Linear MCP configured globally
-    linear_api_key = os.environ.get("LINEAR_API_KEY")
+    # The OAuth token itself is read by the SDK from the environment
+    _, linear_api_key = get_env_credentials()
 
-    # Create comprehensive security settings
-    # Note: Using relative paths ("./**") restricts access to project directory
-    # since cwd is set to project_dir
-    security_settings = {
-        "sandbox": {"enabled": True, "autoAllowBashIfSandboxed": True},
-        "permissions": {
-            "defaultMode": "acceptEdits",  # Auto-approve edits within allowed directories
-            "allow": [
-                # Allow all file operations within the project directory
-                "Read(./**)",
-                "Write(./**)",
-                "Edit(./**)",
-                "Glob(./**)",
-                "Grep(./**)",
-                # Bash permission granted here, but actual commands are validated
-                # by the bash_security_hook (see security.py for allowed commands)
-                "Bash(*)",
-                # Allow Linear MCP tools for project management
-                *LINEAR_TOOLS,
-                # Note: Browser automation uses dev-browser skill via Bash scripts
-                # (no MCP tools needed - uses Playwright directly)
-            ],
-        },
-    }
-
-    # Ensure project directory exists before creating settings file
-    project_dir.mkdir(parents=True, exist_ok=True)
+    # Resolve at most once (run_autonomous_agent already passes an absolute path);
+    # everything below, including settings_file, derives from this absolute path
+    if not project_dir.is_absolute():
+        project_dir = project_dir.resolve()
 
     # Write settings to a file in the project directory
+    # (skipped when the file already holds identical settings, e.g. on later sessions)
     settings_file = project_dir / ".claude_settings.json"
-    with open(settings_file, "w") as f:
-        json.dump(security_settings, f, indent=2)
+    settings_changed = _write_settings_if_changed(settings_file, _SECURITY_SETTINGS_JSON)
 
-    print(f"Created security settings at {settings_file}")
-    print("   - Sandbox enabled (OS-level bash isolation)")
-    print(f"   - Filesystem restricted to: {project_dir.resolve()}")
-    print("   - Bash commands restricted to allowlist (see security.py)")
-    print("   - Browser automation: dev-browser skill (Playwright via Bash scripts)")
-    print("   - MCP servers: linear (project management)")
-    print()
+    # The banner is identical every session - only repeat it if settings changed
+    global _settings_banner_shown
+    show_banner = settings_changed or not _settings_banner_shown
+    _settings_banner_shown = True
 
     # Configure MCP servers
     # Linear MCP: try API key first, then OAuth from credentials
@@ -170,44 +355,52 @@ def create_client(project_dir: Path, model: str) -> ClaudeSDKClient:
         # Linear MCP with HTTP transport using API key
         mcp_servers["linear-server"] = {
             "type": "http",
-            "url": "https://mcp.linear.app/mcp",
+            "url": LINEAR_MCP_URL,
             "headers": {
                 "Authorization": f"Bearer {linear_api_key}"
             }
         }
-        print("   - Linear MCP: using LINEAR_API_KEY")
+        linear_status = "using LINEAR_API_KEY"
     else:
         # Try to extract OAuth token from Claude Code global config
         linear_oauth = get_linear_oauth_from_credentials()
         if linear_oauth:
+            access_token, server_url = linear_oauth
             # Linear MCP with SSE transport using OAuth token
             mcp_servers["linear-server"] = {
                 "type": "sse",
-                "url": linear_oauth["serverUrl"],
+                "url": server_url,
                 "headers": {
-                    "Authorization": f"Bearer {linear_oauth['accessToken']}"
+                    "Authorization": f"Bearer {access_token}"
                 }
             }
-            print("   - Linear MCP: using OAuth from ~/.claude/.credentials.json")
+            linear_status = "using OAuth from ~/.claude/.credentials.json"
         else:
-            print("   - Linear MCP: NOT CONFIGURED (set LINEAR_API_KEY or authenticate via Claude Code)")
+            linear_status = "NOT CONFIGURED (set LINEAR_API_KEY or authenticate via Claude Code)"
+
+    # Emit the banner in a single write
+    if show_banner:
+        sys.stdout.write(
+            f"{'Created' if settings_changed else 'Using'} security settings at {settings_file}\n"
+            "   - Sandbox enabled (OS-level bash isolation)\n"
+            f"   - Filesystem restricted to: {project_dir}\n"
+            "   - Bash commands restricted to allowlist (see security.py)\n"
+            "   - Browser automation: dev-browser skill (Playwright via Bash scripts)\n"
+            "   - MCP servers: linear (project management)\n"
+            f"   - Linear MCP: {linear_status}\n"
+            "\n"
+        )
+        sys.stdout.flush()
 
     return ClaudeSDKClient(
         options=ClaudeCodeOptions(
             model=model,
-            system_prompt="You are an expert full-stack developer building a production-quality web application. You use Linear for project management and tracking all your work. For browser automation, you use the dev-browser skill via Bash scripts with Playwright.",
-            allowed_tools=[
-                *BUILTIN_TOOLS,
-                *LINEAR_TOOLS,
-            ],
+            system_prompt=SYSTEM_PROMPT,
+            allowed_tools=list(ALLOWED_TOOLS),
             mcp_servers=mcp_servers,
-            hooks={
-                "PreToolUse": [
-                    HookMatcher(matcher="Bash", hooks=[bash_security_hook]),
-                ],
-            },
+            hooks=_security_hooks(),
             max_turns=1000,
-            cwd=str(project_dir.resolve()),
-            settings=str(settings_file.resolve()),  # Use absolute path
+            cwd=str(project_dir),
+            settings=str(settings_file),  # Absolute, as project_dir is
         )
     )
@@ -7,11 +7,22 @@ Progress is tracked via Linear issues, with local state cached in .linear_projec
 """
 
 import json
+import os
+import sys
 from pathlib import Path
 
 from linear_config import LINEAR_PROJECT_MARKER
 
 
+# Parsed state files keyed by path: ((mtime_ns, size), state)
+_STATE_CACHE: dict[str, tuple[tuple[int, int], dict]] = {}
+
+
+def _marker_path(project_dir: Path) -> str:
+    """Path to the marker file, as a plain string (these helpers are called often)."""
+    return os.path.join(os.fspath(project_dir), LINEAR_PROJECT_MARKER)
+
+
 def load_linear_project_state(project_dir: Path) -> dict | None:
     """
     Load the Linear project state from the marker file.
@@ -22,17 +33,30 @@ def load_linear_project_state(project_dir: Path) -> dict | None:
     Returns:
         Project state dict or None if not initialized
     """
-    marker_file = project_dir / LINEAR_PROJECT_MARKER
+    marker_file = _marker_path(project_dir)
 
-    if not marker_file.exists():
+    try:
+        st = os.stat(marker_file)
+    except FileNotFoundError:
         return None
 
+    # Reuse the parsed state while the file is unchanged
+    fingerprint = (st.st_mtime_ns, st.st_size)
+    cached = _STATE_CACHE.get(marker_file)
+    if cached and cached[0] == fingerprint:
+        return dict(cached[1])
+
     try:
         with open(marker_file, "r") as f:
-            return json.load(f)
+            state = json.load(f)
     except (json.JSONDecodeError, IOError):
         return None
 
+    if isinstance(state, dict):
+        _STATE_CACHE[marker_file] = (fingerprint, state)
+        return dict(state)
+    return state
+
 
 def is_linear_initialized(project_dir: Path) -> bool:
     """
@@ -44,6 +68,7 @@ def is_linear_initialized(project_dir: Path) -> bool:
     Returns:
         True if .linear_project.json exists and is valid
     """
+    # load_linear_project_state is memoized, so repeat checks only cost a stat
     state = load_linear_project_state(project_dir)
     return state is not None and state.get("initialized", False)
 
@@ -52,10 +77,12 @@ def print_session_header(session_num: int, is_initializer: bool) -> None:
     """Print a formatted header for the session."""
     session_type = "INITIALIZER" if is_initializer else "CODING AGENT"
 
-    print("\n" + "=" * 70)
-    print(f"  SESSION {session_num}: {session_type}")
-    print("=" * 70)
-    print()
+    sys.stdout.write(
+        "\n" + "=" * 70 + "\n"
+        f"  SESSION {session_num}: {session_type}\n"
+        + "=" * 70 + "\n\n"
+    )
+    sys.stdout.flush()
 
 
 def print_progress_summary(project_dir: Path) -> None:
@@ -75,7 +102,10 @@ def print_progress_summary(project_dir: Path) -> None:
     total = state.get("total_issues", 0)
     meta_issue = state.get("meta_issue_id", "unknown")
 
-    print(f"\nLinear Project Status:")
-    print(f"  Total issues created: {total}")
-    print(f"  META issue ID: {meta_issue}")
-    print(f"  (Check Linear for current Done/In Progress/Todo counts)")
+    sys.stdout.write(
+        "\nLinear Project Status:\n"
+        f"  Total issues created: {total}\n"
+        f"  META issue ID: {meta_issue}\n"
+        "  (Check Linear for current Done/In Progress/Todo counts)\n"
+    )
+    sys.stdout.flush()
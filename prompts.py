@@ -5,6 +5,7 @@ Prompt Loading Utilities
 Functions for loading prompt templates from the prompts directory.
 """
 
+import functools
 import shutil
 from pathlib import Path
 
@@ -12,8 +13,14 @@ from pathlib import Path
 PROMPTS_DIR = Path(__file__).parent / "prompts"
 
 
+@functools.lru_cache(maxsize=None)
 def load_prompt(name: str) -> str:
-    """Load a prompt template from the prompts directory."""
+    """
+    Load a prompt template from the prompts directory.
+
+    Templates are read once per process; call load_prompt.cache_clear()
+    to pick up edits made while the harness is running.
+    """
     prompt_path = PROMPTS_DIR / f"{name}.md"
     return prompt_path.read_text()
 
@@ -57,5 +64,6 @@ def copy_spec_to_project(project_dir: Path, spec_path: Path | str) -> None:
 
     spec_dest = project_dir / "app_spec.txt"
     if not spec_dest.exists():
-        shutil.copy(spec_source, spec_dest)
+        # copyfile: contents only (no mode bits), using os.sendfile where available
+        shutil.copyfile(spec_source, spec_dest)
         print(f"Copied {spec_source.name} to project directory as app_spec.txt")
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Client Configuration Tests
+==========================
+
+Tests for the settings file and credentials helpers used by create_client.
+Run with: python test_client.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import client
+
+
+def check(description: str, result, expected) -> bool:
+    """Compare a result against its expected value and print the outcome."""
+    if result == expected:
+        print(f"  PASS: {description}")
+        return True
+    print(f"  FAIL: {description}")
+    print(f"         Expected: {expected!r}, Got: {result!r}")
+    return False
+
+
+def test_write_settings():
+    """Test that the settings file is written only when its contents differ."""
+    print("\nTesting settings file writes:\n")
+    results = []
+    payload = client._SECURITY_SETTINGS_JSON
+
+    with tempfile.TemporaryDirectory() as tmp:
+        settings_file = Path(tmp) / "project" / ".claude_settings.json"
+        write = client._write_settings_if_changed
+
+        results.append(check("first write creates the file", write(settings_file, payload), True))
+        results.append(check("file holds the payload", settings_file.read_bytes(), payload))
+        results.append(check("unchanged file is skipped", write(settings_file, payload), False))
+
+        # Changed by hand, with a different size
+        settings_file.write_text("{}")
+        results.append(check("hand-edited file is rewritten", write(settings_file, payload), True))
+        results.append(check("rewritten file holds the payload", settings_file.read_bytes(), payload))
+
+        # Changed by hand, same size (only the stat time gives it away)
+        edited = payload.replace(b"true", b"TRUE")
+        settings_file.write_bytes(edited)
+        st = settings_file.stat()
+        os.utime(settings_file, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+        results.append(check("same-size hand edit is rewritten", write(settings_file, payload), True))
+        results.append(check("same-size edit is replaced", settings_file.read_bytes(), payload))
+
+        # Left by an earlier run: verified by content, not rewritten
+        client._settings_written.clear()
+        mtime_before = settings_file.stat().st_mtime_ns
+        results.append(check("file from an earlier run is skipped", write(settings_file, payload), False))
+        results.append(check("file from an earlier run is untouched",
+                             settings_file.stat().st_mtime_ns, mtime_before))
+
+        results.append(check("no temp file left behind",
+                             sorted(p.name for p in settings_file.parent.iterdir()),
+                             [".claude_settings.json"]))
+
+    client._settings_written.clear()
+    passed = sum(results)
+    return passed, len(results) - passed
+
+
+def test_linear_oauth_cache():
+    """Test the Linear OAuth lookup and its file-change cache."""
+    print("\nTesting Linear OAuth credentials lookup:\n")
+    results = []
+
+    original_path = client._credentials_path
+    original_read = client._read_linear_oauth
+    reads = []
+
+    def counting_read(path):
+        reads.append(path)
+        return original_read(path)
+
+    def write_creds(creds_file: Path, data, mtime_offset: int) -> None:
+        creds_file.write_text(data if isinstance(data, str) else json.dumps(data))
+        # Force a distinct mtime, in case writes land in the same clock tick
+        st = creds_file.stat()
+        os.utime(creds_file, ns=(st.st_atime_ns, st.st_mtime_ns + mtime_offset * 1_000_000_000))
+
+    def entry(token):
+        return {"mcpOAuth": {
+            "other-server|abc": {"accessToken": "nope", "serverUrl": "https://other"},
+            "linear-server|123": {"accessToken": token, "serverUrl": "https://mcp.linear.app/sse"},
+        }}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        creds_file = Path(tmp) / ".credentials.json"
+        client._credentials_path = lambda: creds_file
+        client._read_linear_oauth = counting_read
+        client._linear_oauth_cache = None
+        lookup = client.get_linear_oauth_from_credentials
+
+        try:
+            results.append(check("missing file", lookup(), None))
+
+            write_creds(creds_file, entry("token-1"), 1)
+            results.append(check("Linear entry found", lookup(), ("token-1", "https://mcp.linear.app/sse")))
+            reads.clear()
+            results.append(check("repeat lookup returns cached result", lookup(),
+                                 ("token-1", "https://mcp.linear.app/sse")))
+            results.append(check("repeat lookup doesn't re-read", len(reads), 0))
+
+            write_creds(creds_file, entry("token-2"), 2)
+            results.append(check("changed file is re-read", lookup(), ("token-2", "https://mcp.linear.app/sse")))
+
+            write_creds(creds_file, {"mcpOAuth": {"other-server|abc": {"accessToken": "x"}}}, 3)
+            results.append(check("no Linear entry", lookup(), None))
+
+            write_creds(creds_file, {"mcpOAuth": {"linear-server|123": {"accessToken": "x"}}}, 4)
+            results.append(check("Linear entry without serverUrl", lookup(), None))
+
+            write_creds(creds_file, '{"mcpOAuth": {"linear-server|123": ', 5)
+            results.append(check("malformed file", lookup(), None))
+
+            # The stdlib parser is used when orjson isn't installed
+            original_orjson = client.orjson
+            client.orjson = None
+            try:
+                write_creds(creds_file, entry("token-3"), 6)
+                results.append(check("lookup without orjson", lookup(),
+                                     ("token-3", "https://mcp.linear.app/sse")))
+            finally:
+                client.orjson = original_orjson
+        finally:
+            client._credentials_path = original_path
+            client._read_linear_oauth = original_read
+            client._linear_oauth_cache = None
+
+    passed = sum(results)
+    return passed, len(results) - passed
+
+
+def main():
+    print("=" * 70)
+    print("  CLIENT CONFIGURATION TESTS")
+    print("=" * 70)
+
+    passed = 0
+    failed = 0
+
+    settings_passed, settings_failed = test_write_settings()
+    passed += settings_passed
+    failed += settings_failed
+
+    oauth_passed, oauth_failed = test_linear_oauth_cache()
+    passed += oauth_passed
+    failed += oauth_failed
+
+    # Summary
+    print("\n" + "-" * 70)
+    print(f"  Results: {passed} passed, {failed} failed")
+    print("-" * 70)
+
+    if failed == 0:
+        print("\n  ALL TESTS PASSED")
+        return 0
+    else:
+        print(f"\n  {failed} TEST(S) FAILED")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())